@@ -0,0 +1,68 @@
+from typing import List, Sequence
+from sqlmodel import Session, asc, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import json_dumps
+from app.models import Analytics, AnalyticsMonthly
+
+# Columns written by copy_analytics; id and created_at come from their server defaults
+ANALYTICS_COPY_COLUMNS = (
+    "business_id",
+    "date",
+    "platform_type",
+    "leads_count",
+    "qualified_leads_count",
+    "converted_leads_count",
+    "total_spend_cents",
+    "total_revenue_cents",
+    "cost_per_lead",
+    "conversion_rate",
+    "metrics",
+)
+
+
+def analytics_record(row: Analytics) -> tuple:
+    """A row in the column order of ANALYTICS_COPY_COLUMNS, with values in the types asyncpg's binary codecs expect."""
+    return (
+        row.business_id,
+        row.date,
+        row.platform_type.value if row.platform_type is not None else None,
+        row.leads_count,
+        row.qualified_leads_count,
+        row.converted_leads_count,
+        row.total_spend_cents,
+        row.total_revenue_cents,
+        row.cost_per_lead,
+        row.conversion_rate,
+        # same encoder as the engine, so COPY and ORM writes store identical JSON
+        json_dumps(row.metrics),
+    )
+
+
+async def copy_analytics(session: AsyncSession, rows: Sequence[Analytics]) -> int:
+    """Write a batch of analytics rows with PostgreSQL's binary COPY instead of INSERT.
+
+    The rows are never added to the session; they only carry the values. Commits the caller's session and
+    returns the number of rows written.
+    """
+    if not rows:
+        return 0
+    # a batch of tens of thousands of rows can outlast the per-statement limit every other query runs under
+    await session.execute(text("SET LOCAL statement_timeout = 0"))
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    if raw_connection.driver_connection is None:
+        raise RuntimeError("COPY needs an open asyncpg connection")
+    await raw_connection.driver_connection.copy_records_to_table(
+        Analytics.__tablename__,
+        records=[analytics_record(row) for row in rows],
+        columns=ANALYTICS_COPY_COLUMNS,
+    )
+    await session.commit()
+    return len(rows)
+
+
+def list_monthly_analytics(session: Session, business_id: int) -> List[AnalyticsMonthly]:
+    """A business's monthly rollups per platform, oldest month first, as of the last view refresh."""
+    query = select(AnalyticsMonthly).where(AnalyticsMonthly.business_id == business_id)
+    return list(session.exec(query.order_by(asc(AnalyticsMonthly.month), asc(AnalyticsMonthly.platform_type))).all())
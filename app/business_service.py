@@ -0,0 +1,50 @@
+from typing import List, Optional
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, asc, select
+
+from app.cache import TTLCache
+from app.database import strict_load
+from app.models import Business, BusinessRead, BusinessUpdate
+
+# Businesses are read on every lead ingestion and rarely written
+_business_cache: TTLCache[int, BusinessRead] = TTLCache(maxsize=10_000, ttl=60)
+
+
+def list_businesses(session: Session, owner_id: int) -> List[Business]:
+    """An owner's businesses with their services, loaded in one extra IN query."""
+    query = strict_load(select(Business)).options(selectinload(Business.services))  # type: ignore[arg-type]
+    query = query.where(Business.owner_id == owner_id).order_by(asc(Business.name))
+    return list(session.exec(query).all())
+
+
+def get_business(session: Session, business_id: int, revalidate: bool = False) -> Optional[BusinessRead]:
+    """A business snapshot, served from the in-process cache for up to a minute after it was loaded.
+
+    With revalidate=True a cached snapshot is only trusted if the row's updated_at still matches it,
+    which costs one single-column lookup instead of loading the row.
+    """
+    cached = _business_cache.get(business_id)
+    if cached is not None and revalidate:
+        updated_at = session.exec(select(Business.updated_at).where(Business.id == business_id)).first()
+        if updated_at != cached.updated_at:
+            cached = None
+    if cached is None:
+        business = session.exec(strict_load(select(Business)).where(Business.id == business_id)).first()
+        if business is None:
+            _business_cache.pop(business_id)
+            return None
+        cached = BusinessRead.model_validate(business)
+        _business_cache.set(business_id, cached)
+    return cached
+
+
+def update_business(session: Session, business_id: int, business_data: BusinessUpdate) -> Optional[Business]:
+    business = session.get(Business, business_id)
+    if business is None:
+        return None
+    business.sqlmodel_update(business_data.model_dump(exclude_unset=True))
+    session.add(business)
+    session.commit()
+    session.refresh(business)
+    _business_cache.pop(business_id)
+    return business
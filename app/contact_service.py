@@ -0,0 +1,44 @@
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import ColumnElement, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select
+
+from app.models import Contact
+
+ContactKey = Tuple[Optional[str], Optional[str]]
+
+
+def contact_key(email: Optional[str], phone: Optional[str]) -> Optional[ContactKey]:
+    """Normalized (email, phone) pair identifying a contact, or None when neither is given."""
+    email = email.strip().lower() if email and email.strip() else None
+    phone = phone.strip() if phone and phone.strip() else None
+    if email is None and phone is None:
+        return None
+    return email, phone
+
+
+def contact_match(key: ContactKey) -> ColumnElement[bool]:
+    """WHERE clause for one contact key; `=` and IS NULL per part, since IS NOT DISTINCT FROM cannot use the index."""
+    email, phone = key
+    return and_(
+        col(Contact.email).is_(None) if email is None else col(Contact.email) == email,
+        col(Contact.phone).is_(None) if phone is None else col(Contact.phone) == phone,
+    )
+
+
+def resolve_contacts(session: Session, keys: Iterable[Optional[ContactKey]]) -> Dict[ContactKey, int]:
+    """Map contact keys to contact ids, inserting the ones not stored yet.
+
+    Runs one INSERT ... ON CONFLICT DO NOTHING and one SELECT for the whole batch. The caller commits.
+    """
+    # sorted so concurrent batches take the unique index locks in the same order
+    wanted = sorted({key for key in keys if key is not None}, key=lambda key: (key[0] or "", key[1] or ""))
+    if not wanted:
+        return {}
+    session.execute(
+        insert(Contact)
+        .values([{"email": email, "phone": phone} for email, phone in wanted])
+        .on_conflict_do_nothing(index_elements=["email", "phone"])
+    )
+    query = select(Contact.id, Contact.email, Contact.phone).where(or_(*(contact_match(key) for key in wanted)))
+    return {(email, phone): contact_id for contact_id, email, phone in session.execute(query)}
@@ -0,0 +1,36 @@
+import base64
+import os
+import orjson
+from typing import Any, Dict, Optional
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Sealed layout: 12-byte random nonce followed by the AES-GCM ciphertext with its 16-byte tag appended
+NONCE_SIZE = 12
+
+
+def credentials_key() -> bytes:
+    """The 256-bit AES key from APP_CREDENTIALS_KEY, stored as URL-safe base64."""
+    return decode_credentials_key(os.environ.get("APP_CREDENTIALS_KEY"))
+
+
+def decode_credentials_key(encoded: Optional[str]) -> bytes:
+    if not encoded:
+        raise RuntimeError("APP_CREDENTIALS_KEY is not set")
+    key = base64.urlsafe_b64decode(encoded)
+    if len(key) != 32:
+        raise RuntimeError("APP_CREDENTIALS_KEY must decode to 32 bytes")
+    return key
+
+
+def seal_credentials(credentials: Dict[str, Any], key: Optional[bytes] = None) -> bytes:
+    """Encrypt and authenticate a credentials dict for storage in a BYTEA column."""
+    nonce = os.urandom(NONCE_SIZE)
+    return nonce + AESGCM(key or credentials_key()).encrypt(nonce, orjson.dumps(credentials), None)
+
+
+def open_credentials(sealed: Optional[bytes], key: Optional[bytes] = None) -> Dict[str, Any]:
+    """Decrypt a value from seal_credentials(); raises cryptography's InvalidTag if it was tampered with."""
+    if not sealed:
+        return {}
+    nonce, ciphertext = sealed[:NONCE_SIZE], sealed[NONCE_SIZE:]
+    return orjson.loads(AESGCM(key or credentials_key()).decrypt(nonce, ciphertext, None))
@@ -0,0 +1,222 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
+from sqlmodel import Session, asc, col, desc, select, text, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.contact_service import contact_key, resolve_contacts
+from app.database import json_dumps, strict_load
+from app.models import Lead, LeadCreate, LeadStatus, Message, MessageCreate
+
+# platform_data keys stored in their own Lead columns instead of the JSON blob
+PROMOTED_PLATFORM_KEYS = ("source_url", "score")
+# Limits of the promoted columns: Lead.source_url is VARCHAR(512), Lead.score is INTEGER
+SOURCE_URL_MAX_LENGTH = 512
+SCORE_MIN, SCORE_MAX = -(2**31), 2**31 - 1
+
+# Rows fetched per round trip from the server-side cursor when streaming exports
+STREAM_BATCH_SIZE = 500
+
+
+def promoted_column_value(key: str, value: Any) -> Optional[Any]:
+    """The column value for a promoted platform_data key, or None when the value does not fit the column."""
+    if key == "score":
+        # only integral numbers: rounding would lose the fraction once the key leaves platform_data
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if isinstance(value, float) and not value.is_integer():
+            return None
+        score = int(value)
+        return score if SCORE_MIN <= score <= SCORE_MAX else None
+    if isinstance(value, str) and len(value) <= SOURCE_URL_MAX_LENGTH:
+        return value
+    return None
+
+
+def split_platform_data(platform_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split raw platform data into promoted column values and the long tail kept in platform_data.
+
+    A promoted key whose value does not fit its column (a fractional score, an over-long URL) stays in the
+    remainder, so one odd lead cannot fail a whole batch insert.
+    """
+    promoted: Dict[str, Any] = {}
+    remainder: Dict[str, Any] = {}
+    for key, value in platform_data.items():
+        column_value = promoted_column_value(key, value) if key in PROMOTED_PLATFORM_KEYS else None
+        if column_value is None:
+            remainder[key] = value
+        else:
+            promoted[key] = column_value
+    return promoted, remainder
+
+
+def lead_values(business_id: int, lead_data: LeadCreate, contact_id: Optional[int] = None) -> Dict[str, Any]:
+    """Column values of a new lead; every lead gets the same keys so rows can share one multi-row INSERT."""
+    promoted, platform_data = split_platform_data(lead_data.platform_data)
+    return {
+        "business_id": business_id,
+        **lead_data.model_dump(exclude={"platform_data", "customer_email", "customer_phone"}),
+        "contact_id": contact_id,
+        "platform_data": platform_data,
+        **{key: promoted.get(key) for key in PROMOTED_PLATFORM_KEYS},
+    }
+
+
+def create_lead(session: Session, business_id: int, lead_data: LeadCreate) -> Lead:
+    key = contact_key(lead_data.customer_email, lead_data.customer_phone)
+    contact_ids = resolve_contacts(session, [key])
+    lead = Lead(**lead_values(business_id, lead_data, contact_ids.get(key) if key else None))
+    session.add(lead)
+    session.commit()
+    session.refresh(lead)
+    return lead
+
+
+def bulk_insert_leads(session: Session, business_id: int, leads: Sequence[LeadCreate]) -> List[int]:
+    """Store a batch of synced leads with one INSERT, bypassing the ORM unit of work.
+
+    Leads whose (platform_account_id, platform_lead_id) is already stored are skipped, so a platform poll can
+    resend leads it returned before. Returns the ids of the newly inserted leads only.
+    """
+    if not leads:
+        return []
+    keys = [contact_key(lead_data.customer_email, lead_data.customer_phone) for lead_data in leads]
+    contact_ids = resolve_contacts(session, keys)
+    statement = (
+        insert(Lead)
+        .values(
+            [
+                lead_values(business_id, lead_data, contact_ids.get(key) if key else None)
+                for lead_data, key in zip(leads, keys)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["platform_account_id", "platform_lead_id"])
+        .returning(col(Lead.id))
+    )
+    lead_ids = list(session.execute(statement).scalars())
+    session.commit()
+    return lead_ids
+
+
+def bulk_update_lead_status(session: Session, lead_ids: Sequence[int], status: LeadStatus) -> None:
+    """Set the status of many leads in one UPDATE without loading or synchronizing them in the session."""
+    if not lead_ids:
+        return
+    statement = (
+        update(Lead)
+        .where(col(Lead.id).in_(lead_ids))
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(statement)
+    session.commit()
+
+
+def backfill_promoted_platform_fields(session: Session) -> int:
+    """One-off move of promoted keys out of platform_data for leads stored before the columns existed.
+
+    Values that do not fit their column are left in platform_data, as split_platform_data() does for new leads.
+    """
+    result = session.connection().execute(
+        text(
+            """
+            WITH promotable AS (
+                SELECT id,
+                       CASE WHEN jsonb_typeof(platform_data->'source_url') = 'string'
+                                 AND length(platform_data->>'source_url') <= 512
+                            THEN platform_data->>'source_url' END AS source_url,
+                       -- nested CASE: the cast must only run on JSON numbers; fractional scores stay in platform_data
+                       CASE WHEN jsonb_typeof(platform_data->'score') = 'number'
+                            THEN CASE WHEN (platform_data->>'score')::numeric = trunc((platform_data->>'score')::numeric)
+                                           AND (platform_data->>'score')::numeric BETWEEN -2147483648 AND 2147483647
+                                      THEN (platform_data->>'score')::numeric::integer END
+                       END AS score
+                FROM leads
+                WHERE platform_data ?| array['source_url', 'score']
+            )
+            UPDATE leads
+            SET source_url = COALESCE(leads.source_url, promotable.source_url),
+                score = COALESCE(leads.score, promotable.score),
+                platform_data = leads.platform_data - array_remove(
+                    ARRAY[
+                        CASE WHEN promotable.source_url IS NOT NULL THEN 'source_url' END,
+                        CASE WHEN promotable.score IS NOT NULL THEN 'score' END
+                    ],
+                    NULL
+                )
+            FROM promotable
+            WHERE leads.id = promotable.id
+              AND (promotable.source_url IS NOT NULL OR promotable.score IS NOT NULL)
+            """
+        )
+    )
+    session.commit()
+    return result.rowcount
+
+
+def list_leads(session: Session, business_id: int, status: Optional[LeadStatus] = None) -> List[Lead]:
+    """Newest leads first, with the platform account, service and contact shown on the lead list."""
+    query = strict_load(select(Lead)).options(
+        joinedload(Lead.platform_account),  # type: ignore[arg-type]
+        joinedload(Lead.service),  # type: ignore[arg-type]
+        joinedload(Lead.contact),  # type: ignore[arg-type]
+    )
+    query = query.where(Lead.business_id == business_id)
+    if status is not None:
+        query = query.where(Lead.status == status)
+    return list(session.exec(query.order_by(desc(Lead.created_at))).all())
+
+
+def create_message(session: Session, message_data: MessageCreate, user_id: Optional[int] = None) -> Message:
+    key = contact_key(message_data.sender_email, None)
+    contact_ids = resolve_contacts(session, [key])
+    message = Message(
+        **message_data.model_dump(exclude={"sender_email"}),
+        user_id=user_id,
+        contact_id=contact_ids.get(key) if key else None,
+    )
+    session.add(message)
+    session.commit()
+    session.refresh(message)
+    return message
+
+
+def list_messages(session: Session, lead_id: int) -> List[Message]:
+    """A lead's conversation in chronological order, with the replying user and sender contact if any."""
+    query = strict_load(select(Message)).options(
+        joinedload(Message.user),  # type: ignore[arg-type]
+        joinedload(Message.contact),  # type: ignore[arg-type]
+    )
+    query = query.where(Message.lead_id == lead_id).order_by(asc(Message.created_at), asc(Message.id))
+    return list(session.exec(query).all())
+
+
+async def stream_leads(session: AsyncSession, business_id: int) -> AsyncIterator[Lead]:
+    """A business's leads with their contact, fetched through a server-side cursor so memory stays at one batch."""
+    query = strict_load(select(Lead)).options(joinedload(Lead.contact))  # type: ignore[arg-type]
+    query = query.where(Lead.business_id == business_id).order_by(asc(Lead.id))
+    result = await session.stream_scalars(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for lead in result:
+        yield lead
+
+
+async def stream_messages(session: AsyncSession, lead_id: int) -> AsyncIterator[Message]:
+    """A lead's conversation in chronological order with the sender contact, fetched through a server-side cursor."""
+    query = strict_load(select(Message)).options(joinedload(Message.contact))  # type: ignore[arg-type]
+    query = query.where(Message.lead_id == lead_id)
+    query = query.order_by(asc(Message.created_at), asc(Message.id))
+    result = await session.stream_scalars(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for message in result:
+        yield message
+
+
+async def export_leads_ndjson(session: AsyncSession, business_id: int) -> AsyncIterator[bytes]:
+    """A business's leads with the contact's email and phone as newline-delimited JSON for a StreamingResponse."""
+    async for lead in stream_leads(session, business_id):
+        contact = lead.contact
+        row = {
+            **lead.model_dump(),
+            "email": contact.email if contact is not None else None,
+            "phone": contact.phone if contact is not None else None,
+        }
+        yield (json_dumps(row) + "\n").encode()
@@ -1,10 +1,41 @@
+import re
+from pydantic import field_validator
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+from sqlalchemy import (
+    DDL,
+    TIMESTAMP,
+    BigInteger,
+    CheckConstraint,
+    Enum as SAEnum,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
 from enum import Enum
 
 
+# JSON columns are stored as binary JSONB on PostgreSQL so they can be GIN-indexed
+JSON_VARIANT = JSON().with_variant(JSONB(), "postgresql")
+
+
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+
+
+def _normalize_email(value: str) -> str:
+    if _EMAIL_RE.match(value) is None:
+        raise ValueError("Invalid email address")
+    # stored lowercased so the unique index on users.email is case-insensitive
+    return value.lower()
+
+
 # Enums for better type safety and data consistency
 class PlatformType(str, Enum):
     THUMBTACK = "thumbtack"
@@ -48,24 +79,44 @@ class BusinessCategory(str, Enum):
     OTHER = "other"
 
 
+def enum_column(enum_cls: type[Enum], name: str, **kwargs: Any) -> Column:
+    """Native PostgreSQL ENUM column labelled with the member values ("new"), not the member names ("NEW")."""
+    return Column(SAEnum(enum_cls, name=name, values_callable=lambda members: [m.value for m in members]), **kwargs)
+
+
+def created_at_column(primary_key: bool = False) -> Column:
+    """TIMESTAMPTZ filled in by PostgreSQL on INSERT."""
+    return Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, primary_key=primary_key)
+
+
+def updated_at_column() -> Column:
+    """TIMESTAMPTZ filled in by PostgreSQL on INSERT and set to now() by every ORM UPDATE."""
+    return Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 # Persistent models (stored in database)
 class User(SQLModel, table=True):
     __tablename__ = "users"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    email: str = Field(unique=True, max_length=255, regex=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+    email: str = Field(unique=True, max_length=255)
     first_name: str = Field(max_length=100)
     last_name: str = Field(max_length=100)
     phone: Optional[str] = Field(default=None, max_length=20)
     password_hash: str = Field(max_length=255)
     is_active: bool = Field(default=True)
     email_verified: bool = Field(default=False)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     business: Optional["Business"] = Relationship(back_populates="owner")
-    messages: List["Message"] = Relationship(back_populates="user")
+    messages: List["Message"] = Relationship(back_populates="user", sa_relationship_kwargs={"lazy": "raise"})
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        return _normalize_email(value)
 
 
 class Business(SQLModel, table=True):
@@ -74,7 +125,12 @@ class Business(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_id: int = Field(foreign_key="users.id")
     name: str = Field(max_length=200)
-    category: BusinessCategory = Field(default=BusinessCategory.OTHER)
+    category: BusinessCategory = Field(
+        default=BusinessCategory.OTHER,
+        sa_column=enum_column(
+            BusinessCategory, "business_category", nullable=False, server_default=BusinessCategory.OTHER.value
+        ),
+    )
     description: str = Field(max_length=1000)
     address: str = Field(max_length=500)
     city: str = Field(max_length=100)
@@ -82,82 +138,126 @@ class Business(SQLModel, table=True):
     zip_code: str = Field(max_length=10)
     phone: Optional[str] = Field(default=None, max_length=20)
     website: Optional[str] = Field(default=None, max_length=255)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     owner: User = Relationship(back_populates="business")
-    services: List["Service"] = Relationship(back_populates="business")
-    platform_accounts: List["PlatformAccount"] = Relationship(back_populates="business")
-    leads: List["Lead"] = Relationship(back_populates="business")
-    subscriptions: List["Subscription"] = Relationship(back_populates="business")
-    analytics: List["Analytics"] = Relationship(back_populates="business")
+    services: List["Service"] = Relationship(back_populates="business", sa_relationship_kwargs={"lazy": "raise"})
+    platform_accounts: List["PlatformAccount"] = Relationship(
+        back_populates="business", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    subscriptions: List["Subscription"] = Relationship(
+        back_populates="business", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Service(SQLModel, table=True):
     __tablename__ = "services"  # type: ignore[assignment]
+    __table_args__ = (
+        CheckConstraint(
+            "price_min IS NULL OR price_max IS NULL OR price_min <= price_max", name="ck_service_price_range"
+        ),
+        Index("ix_service_active", "business_id", postgresql_where=text("is_active")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="businesses.id")
     name: str = Field(max_length=200)
     description: str = Field(max_length=1000)
-    price_min: Optional[Decimal] = Field(default=None, decimal_places=2)
-    price_max: Optional[Decimal] = Field(default=None, decimal_places=2)
+    price_min: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    price_max: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     duration_hours: Optional[int] = Field(default=None)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     business: Business = Relationship(back_populates="services")
-    leads: List["Lead"] = Relationship(back_populates="service")
 
 
 class PlatformAccount(SQLModel, table=True):
     __tablename__ = "platform_accounts"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_platform_account_active", "business_id", postgresql_where=text("is_active")),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="businesses.id")
-    platform_type: PlatformType
+    platform_type: PlatformType = Field(sa_column=enum_column(PlatformType, "platform_type", nullable=False))
     account_id: str = Field(max_length=255)
     account_name: str = Field(max_length=255)
-    credentials: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    settings: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    # Provider API tokens sealed by crypto.seal_credentials(); None when the account has none
+    credentials_ct: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
+    settings: Dict[str, Any] = Field(default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}"))
     is_active: bool = Field(default=True)
     last_sync: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     business: Business = Relationship(back_populates="platform_accounts")
-    leads: List["Lead"] = Relationship(back_populates="platform_account")
-    campaigns: List["Campaign"] = Relationship(back_populates="platform_account")
+    campaigns: List["Campaign"] = Relationship(
+        back_populates="platform_account", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Campaign(SQLModel, table=True):
     __tablename__ = "campaigns"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_campaign_keywords", "target_keywords", postgresql_using="gin"),
+        Index("ix_campaign_active", "platform_account_id", postgresql_where=text("is_active")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     platform_account_id: int = Field(foreign_key="platform_accounts.id")
     name: str = Field(max_length=255)
     campaign_type: str = Field(max_length=100)  # listing, ad, etc.
-    budget: Optional[Decimal] = Field(default=None, decimal_places=2)
-    target_keywords: List[str] = Field(default=[], sa_column=Column(JSON))
-    target_location: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    settings: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    budget: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    target_keywords: List[str] = Field(
+        default=[], sa_column=Column(ARRAY(String(128)), nullable=False, server_default="{}")
+    )
+    target_location: Dict[str, Any] = Field(
+        default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}")
+    )
+    settings: Dict[str, Any] = Field(default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}"))
     is_active: bool = Field(default=True)
     started_at: Optional[datetime] = Field(default=None)
     ended_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     platform_account: PlatformAccount = Relationship(back_populates="campaigns")
-    leads: List["Lead"] = Relationship(back_populates="campaign")
+
+
+class Contact(SQLModel, table=True):
+    __tablename__ = "contacts"  # type: ignore[assignment]
+    # One row per distinct email/phone pair, shared by every lead and message from that customer
+    __table_args__ = (
+        Index("ix_contact_email_phone", "email", "phone", unique=True, postgresql_nulls_not_distinct=True),
+        CheckConstraint("email IS NOT NULL OR phone IS NOT NULL", name="ck_contact_email_or_phone"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    email: Optional[str] = Field(default=None, max_length=255)
+    phone: Optional[str] = Field(default=None, max_length=20)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
 
 
 class Lead(SQLModel, table=True):
     __tablename__ = "leads"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_lead_business_status_created", "business_id", "status", text("created_at DESC")),
+        Index("ix_lead_platform_account_created", "platform_account_id", text("created_at DESC")),
+        Index("ix_lead_platform_lead_id", "platform_account_id", "platform_lead_id", unique=True),
+        Index("ix_lead_platform_data", "platform_data", postgresql_using="gin"),
+        # Dashboards list the open leads of a business; closed ones are most of the table
+        Index(
+            "ix_lead_business_open",
+            "business_id",
+            text("created_at DESC"),
+            postgresql_where=text("status IN ('new', 'contacted')"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="businesses.id")
@@ -167,52 +267,70 @@ class Lead(SQLModel, table=True):
 
     # Lead contact information
     customer_name: str = Field(max_length=200)
-    customer_email: Optional[str] = Field(default=None, max_length=255)
-    customer_phone: Optional[str] = Field(default=None, max_length=20)
+    contact_id: Optional[int] = Field(default=None, foreign_key="contacts.id", index=True)
 
     # Lead details
     title: str = Field(max_length=300)
     description: str = Field(max_length=2000)
-    budget: Optional[Decimal] = Field(default=None, decimal_places=2)
+    budget: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     location: str = Field(max_length=200)
-    status: LeadStatus = Field(default=LeadStatus.NEW)
+    status: LeadStatus = Field(
+        default=LeadStatus.NEW,
+        sa_column=enum_column(
+            LeadStatus, "lead_status", nullable=False, server_default=LeadStatus.NEW.value, index=True
+        ),
+    )
 
     # Platform-specific data
     platform_lead_id: str = Field(max_length=255)
-    platform_data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    platform_data: Dict[str, Any] = Field(
+        default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}")
+    )
+    # Frequently read platform_data keys, promoted to real columns
+    source_url: Optional[str] = Field(default=None, max_length=512, index=True)
+    score: Optional[int] = Field(default=None)
 
     # Tracking
-    cost: Optional[Decimal] = Field(default=None, decimal_places=2)
-    conversion_value: Optional[Decimal] = Field(default=None, decimal_places=2)
+    cost: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    conversion_value: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     converted_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
-    business: Business = Relationship(back_populates="leads")
-    platform_account: PlatformAccount = Relationship(back_populates="leads")
-    campaign: Optional[Campaign] = Relationship(back_populates="leads")
-    service: Optional[Service] = Relationship(back_populates="leads")
-    messages: List["Message"] = Relationship(back_populates="lead")
+    # One-directional: leads are queried by their foreign keys, never through a collection on the "one" side
+    business: Business = Relationship(sa_relationship_kwargs={"lazy": "joined", "innerjoin": True})
+    platform_account: PlatformAccount = Relationship(sa_relationship_kwargs={"lazy": "joined", "innerjoin": True})
+    campaign: Optional[Campaign] = Relationship(sa_relationship_kwargs={"lazy": "joined"})
+    service: Optional[Service] = Relationship(sa_relationship_kwargs={"lazy": "joined"})
+    contact: Optional[Contact] = Relationship(sa_relationship_kwargs={"lazy": "joined"})
+    messages: List["Message"] = Relationship(back_populates="lead", sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"  # type: ignore[assignment]
+    # Monthly range partitions by created_at; the partition key has to be part of the primary key
+    __table_args__ = (
+        Index("ix_message_lead_created", "lead_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Optional[int] = Field(default=None, primary_key=True)
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     lead_id: int = Field(foreign_key="leads.id")
     user_id: Optional[int] = Field(default=None, foreign_key="users.id")
     sender_name: str = Field(max_length=200)
-    sender_email: Optional[str] = Field(default=None, max_length=255)
+    contact_id: Optional[int] = Field(default=None, foreign_key="contacts.id", index=True)
     content: str = Field(max_length=5000)
     is_from_business: bool = Field(default=False)
     is_read: bool = Field(default=False)
-    attachments: List[str] = Field(default=[], sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    attachments: List[str] = Field(default=[], sa_column=Column(ARRAY(Text), nullable=False, server_default="{}"))
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column(primary_key=True))
 
     # Relationships
-    lead: Lead = Relationship(back_populates="messages")
-    user: Optional[User] = Relationship(back_populates="messages")
+    # not joined: Lead's own joined many-to-ones would ride along on every message row
+    lead: Lead = Relationship(back_populates="messages", sa_relationship_kwargs={"lazy": "raise"})
+    user: Optional[User] = Relationship(back_populates="messages", sa_relationship_kwargs={"lazy": "joined"})
+    contact: Optional[Contact] = Relationship(sa_relationship_kwargs={"lazy": "joined"})
 
 
 class Subscription(SQLModel, table=True):
@@ -221,67 +339,162 @@ class Subscription(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="businesses.id")
     plan_name: str = Field(max_length=100)
-    price: Decimal = Field(decimal_places=2)
+    price: Decimal = Field(max_digits=12, decimal_places=2)
     billing_cycle: str = Field(max_length=20)  # monthly, yearly
-    status: SubscriptionStatus = Field(default=SubscriptionStatus.ACTIVE)
-    features: List[str] = Field(default=[], sa_column=Column(JSON))
+    status: SubscriptionStatus = Field(
+        default=SubscriptionStatus.ACTIVE,
+        sa_column=enum_column(
+            SubscriptionStatus, "subscription_status", nullable=False, server_default=SubscriptionStatus.ACTIVE.value
+        ),
+    )
+    features: List[str] = Field(default=[], sa_column=Column(ARRAY(String(128)), nullable=False, server_default="{}"))
     started_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: Optional[datetime] = Field(default=None)
     cancelled_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
     business: Business = Relationship(back_populates="subscriptions")
-    payments: List["Payment"] = Relationship(back_populates="subscription")
+    payments: List["Payment"] = Relationship(back_populates="subscription", sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Payment(SQLModel, table=True):
     __tablename__ = "payments"  # type: ignore[assignment]
+    __table_args__ = (CheckConstraint("currency ~ '^[A-Z]{3}$'", name="ck_payment_currency"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     subscription_id: int = Field(foreign_key="subscriptions.id")
-    amount: Decimal = Field(decimal_places=2)
+    amount: Decimal = Field(max_digits=12, decimal_places=2)
     currency: str = Field(default="USD", max_length=3)
-    status: PaymentStatus = Field(default=PaymentStatus.PENDING)
+    status: PaymentStatus = Field(
+        default=PaymentStatus.PENDING,
+        sa_column=enum_column(
+            PaymentStatus, "payment_status", nullable=False, server_default=PaymentStatus.PENDING.value
+        ),
+    )
     payment_method: str = Field(max_length=50)  # card, bank_transfer, etc.
     transaction_id: Optional[str] = Field(default=None, max_length=255)
-    processor_response: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    processor_response: Dict[str, Any] = Field(
+        default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}")
+    )
     processed_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=updated_at_column())
 
     # Relationships
-    subscription: Subscription = Relationship(back_populates="payments")
+    subscription: Subscription = Relationship(
+        back_populates="payments", sa_relationship_kwargs={"lazy": "joined", "innerjoin": True}
+    )
 
 
 class Analytics(SQLModel, table=True):
     __tablename__ = "analytics"  # type: ignore[assignment]
-
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        Index("ix_analytics_business_date", "business_id", "date"),
+        Index("ix_analytics_metrics", "metrics", postgresql_using="gin"),
+        # Monthly range partitions by the metric date, which is what dashboard queries filter on
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     business_id: int = Field(foreign_key="businesses.id")
-    date: datetime
-    platform_type: Optional[PlatformType] = Field(default=None)
+    date: datetime = Field(primary_key=True)
+    platform_type: Optional[PlatformType] = Field(
+        default=None, sa_column=enum_column(PlatformType, "platform_type", nullable=True)
+    )
 
     # Metrics
     leads_count: int = Field(default=0)
     qualified_leads_count: int = Field(default=0)
     converted_leads_count: int = Field(default=0)
-    total_spend: Decimal = Field(default=Decimal("0"), decimal_places=2)
-    total_revenue: Decimal = Field(default=Decimal("0"), decimal_places=2)
-    cost_per_lead: Optional[Decimal] = Field(default=None, decimal_places=2)
-    conversion_rate: Optional[Decimal] = Field(default=None, decimal_places=4)
+    # Money totals are whole cents so SUM() over many rows is integer arithmetic
+    total_spend_cents: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+    total_revenue_cents: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+    cost_per_lead: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    conversion_rate: Optional[Decimal] = Field(default=None, max_digits=8, decimal_places=4)
 
     # Additional metrics
-    metrics: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    metrics: Dict[str, Any] = Field(default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}"))
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
 
     # Relationships
-    business: Business = Relationship(back_populates="analytics")
+    business: Business = Relationship()
+
+    @property
+    def total_spend(self) -> Decimal:
+        return Decimal(self.total_spend_cents).scaleb(-2)
+
+    @property
+    def total_revenue(self) -> Decimal:
+        return Decimal(self.total_revenue_cents).scaleb(-2)
+
+
+class AnalyticsMonthly(SQLModel, table=True):
+    """Read-only mapping of the analytics_monthly materialized view: Analytics rolled up per business, month and platform.
+
+    Refreshed by database.refresh_analytics_monthly(), so it lags the analytics table until the next refresh.
+    """
+
+    __tablename__ = "analytics_monthly"  # type: ignore[assignment]
+
+    business_id: int = Field(primary_key=True)
+    month: datetime = Field(primary_key=True)
+    platform_type: Optional[PlatformType] = Field(
+        default=None, sa_column=enum_column(PlatformType, "platform_type", primary_key=True, nullable=True)
+    )
+    leads_count: int
+    qualified_leads_count: int
+    converted_leads_count: int
+    total_spend_cents: int = Field(sa_column=Column(BigInteger))
+    total_revenue_cents: int = Field(sa_column=Column(BigInteger))
+    conversion_rate: Optional[Decimal] = Field(default=None)
+
+    @property
+    def total_spend(self) -> Decimal:
+        return Decimal(self.total_spend_cents).scaleb(-2)
+
+    @property
+    def total_revenue(self) -> Decimal:
+        return Decimal(self.total_revenue_cents).scaleb(-2)
+
+
+# The view is not a table: keep it out of create_all/drop_all and manage it alongside the analytics table
+SQLModel.metadata.remove(SQLModel.metadata.tables["analytics_monthly"])
+event.listen(
+    SQLModel.metadata.tables["analytics"],
+    "after_create",
+    DDL(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS analytics_monthly AS
+        SELECT business_id,
+               date_trunc('month', date) AS month,
+               platform_type,
+               SUM(leads_count)::bigint AS leads_count,
+               SUM(qualified_leads_count)::bigint AS qualified_leads_count,
+               SUM(converted_leads_count)::bigint AS converted_leads_count,
+               SUM(total_spend_cents)::bigint AS total_spend_cents,
+               SUM(total_revenue_cents)::bigint AS total_revenue_cents,
+               round(AVG(conversion_rate), 4) AS conversion_rate
+        FROM analytics
+        GROUP BY business_id, date_trunc('month', date), platform_type;
+        -- REFRESH ... CONCURRENTLY needs a unique index covering every row
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_analytics_monthly_key
+            ON analytics_monthly (business_id, month, platform_type) NULLS NOT DISTINCT;
+        """
+    ),
+)
+event.listen(
+    SQLModel.metadata.tables["analytics"], "before_drop", DDL("DROP MATERIALIZED VIEW IF EXISTS analytics_monthly")
+)
 
 
 class Recommendation(SQLModel, table=True):
     __tablename__ = "recommendations"  # type: ignore[assignment]
+    __table_args__ = (
+        CheckConstraint("priority BETWEEN 1 AND 3", name="ck_recommendation_priority"),
+        CheckConstraint("impact_score BETWEEN 1 AND 10", name="ck_recommendation_impact_score"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="businesses.id")
@@ -290,10 +503,10 @@ class Recommendation(SQLModel, table=True):
     description: str = Field(max_length=1000)
     priority: int = Field(default=1)  # 1=high, 2=medium, 3=low
     impact_score: Optional[int] = Field(default=None)  # 1-10 scale
-    data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON_VARIANT, nullable=False, server_default="{}"))
     is_dismissed: bool = Field(default=False)
     dismissed_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
 
 
 class EmailAlert(SQLModel, table=True):
@@ -308,17 +521,22 @@ class EmailAlert(SQLModel, table=True):
     sent_at: Optional[datetime] = Field(default=None)
     delivery_status: str = Field(default="pending", max_length=50)
     error_message: Optional[str] = Field(default=None, max_length=1000)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=created_at_column())
 
 
 # Non-persistent schemas (for validation, forms, API requests/responses)
 class UserCreate(SQLModel, table=False):
-    email: str = Field(max_length=255, regex=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+    email: str = Field(max_length=255)
     first_name: str = Field(max_length=100)
     last_name: str = Field(max_length=100)
     phone: Optional[str] = Field(default=None, max_length=20)
     password: str = Field(min_length=8, max_length=255)
 
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        return _normalize_email(value)
+
 
 class UserUpdate(SQLModel, table=False):
     first_name: Optional[str] = Field(default=None, max_length=100)
@@ -350,19 +568,35 @@ class BusinessUpdate(SQLModel, table=False):
     website: Optional[str] = Field(default=None, max_length=255)
 
 
+class BusinessRead(SQLModel, table=False):
+    id: int
+    owner_id: int
+    name: str
+    category: BusinessCategory
+    description: str
+    address: str
+    city: str
+    state: str
+    zip_code: str
+    phone: Optional[str] = Field(default=None)
+    website: Optional[str] = Field(default=None)
+    created_at: Optional[datetime] = Field(default=None)
+    updated_at: Optional[datetime] = Field(default=None)
+
+
 class ServiceCreate(SQLModel, table=False):
     name: str = Field(max_length=200)
     description: str = Field(max_length=1000)
-    price_min: Optional[Decimal] = Field(default=None, decimal_places=2)
-    price_max: Optional[Decimal] = Field(default=None, decimal_places=2)
+    price_min: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    price_max: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     duration_hours: Optional[int] = Field(default=None)
 
 
 class ServiceUpdate(SQLModel, table=False):
     name: Optional[str] = Field(default=None, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
-    price_min: Optional[Decimal] = Field(default=None, decimal_places=2)
-    price_max: Optional[Decimal] = Field(default=None, decimal_places=2)
+    price_min: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    price_max: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     duration_hours: Optional[int] = Field(default=None)
     is_active: Optional[bool] = Field(default=None)
 
@@ -391,16 +625,16 @@ class LeadCreate(SQLModel, table=False):
     customer_phone: Optional[str] = Field(default=None, max_length=20)
     title: str = Field(max_length=300)
     description: str = Field(max_length=2000)
-    budget: Optional[Decimal] = Field(default=None, decimal_places=2)
+    budget: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     location: str = Field(max_length=200)
     platform_lead_id: str = Field(max_length=255)
     platform_data: Dict[str, Any] = Field(default={})
-    cost: Optional[Decimal] = Field(default=None, decimal_places=2)
+    cost: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
 
 
 class LeadUpdate(SQLModel, table=False):
     status: Optional[LeadStatus] = Field(default=None)
-    conversion_value: Optional[Decimal] = Field(default=None, decimal_places=2)
+    conversion_value: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
 
 
 class MessageCreate(SQLModel, table=False):
@@ -416,7 +650,7 @@ class CampaignCreate(SQLModel, table=False):
     platform_account_id: int
     name: str = Field(max_length=255)
     campaign_type: str = Field(max_length=100)
-    budget: Optional[Decimal] = Field(default=None, decimal_places=2)
+    budget: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     target_keywords: List[str] = Field(default=[])
     target_location: Dict[str, Any] = Field(default={})
     settings: Dict[str, Any] = Field(default={})
@@ -424,7 +658,7 @@ class CampaignCreate(SQLModel, table=False):
 
 class CampaignUpdate(SQLModel, table=False):
     name: Optional[str] = Field(default=None, max_length=255)
-    budget: Optional[Decimal] = Field(default=None, decimal_places=2)
+    budget: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
     target_keywords: Optional[List[str]] = Field(default=None)
     target_location: Optional[Dict[str, Any]] = Field(default=None)
     settings: Optional[Dict[str, Any]] = Field(default=None)
@@ -433,13 +667,13 @@ class CampaignUpdate(SQLModel, table=False):
 
 class SubscriptionCreate(SQLModel, table=False):
     plan_name: str = Field(max_length=100)
-    price: Decimal = Field(decimal_places=2)
+    price: Decimal = Field(max_digits=12, decimal_places=2)
     billing_cycle: str = Field(max_length=20)
     features: List[str] = Field(default=[])
 
 
 class PaymentCreate(SQLModel, table=False):
     subscription_id: int
-    amount: Decimal = Field(decimal_places=2)
+    amount: Decimal = Field(max_digits=12, decimal_places=2)
     currency: str = Field(default="USD", max_length=3)
     payment_method: str = Field(max_length=50)
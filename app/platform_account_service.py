@@ -0,0 +1,37 @@
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+
+from app.crypto import open_credentials, seal_credentials
+from app.models import PlatformAccount, PlatformAccountCreate, PlatformAccountUpdate
+
+
+def create_platform_account(session: Session, business_id: int, account_data: PlatformAccountCreate) -> PlatformAccount:
+    account = PlatformAccount(
+        business_id=business_id,
+        **account_data.model_dump(exclude={"credentials"}),
+        credentials_ct=seal_credentials(account_data.credentials) if account_data.credentials else None,
+    )
+    session.add(account)
+    session.commit()
+    session.refresh(account)
+    return account
+
+
+def update_platform_account(
+    session: Session, account_id: int, account_data: PlatformAccountUpdate
+) -> Optional[PlatformAccount]:
+    account = session.get(PlatformAccount, account_id)
+    if account is None:
+        return None
+    account.sqlmodel_update(account_data.model_dump(exclude_unset=True, exclude={"credentials"}))
+    if account_data.credentials is not None:
+        account.credentials_ct = seal_credentials(account_data.credentials) if account_data.credentials else None
+    session.add(account)
+    session.commit()
+    session.refresh(account)
+    return account
+
+
+def platform_credentials(account: PlatformAccount) -> Dict[str, Any]:
+    """The decrypted provider credentials of an account; only call this where a platform API is actually used."""
+    return open_credentials(account.credentials_ct)
@@ -1,10 +1,24 @@
-from app.database import create_tables
-from nicegui import ui
+from app.database import create_tables, ensure_partitions, refresh_analytics_monthly
+from nicegui import app, run, ui
+
+
+async def ensure_partitions_job() -> None:
+    # DDL and row moves take seconds; run them on a worker thread instead of blocking every client's event loop
+    await run.io_bound(ensure_partitions)
+
+
+async def refresh_analytics_monthly_job() -> None:
+    # the refresh re-aggregates all analytics with no statement timeout; keep it off the event loop too
+    await run.io_bound(refresh_analytics_monthly)
 
 
 def startup() -> None:
     # this function is called before the first request
     create_tables()
+    # keep monthly partitions created ahead of time while the app runs for weeks without a restart
+    app.timer(24 * 60 * 60, ensure_partitions_job, immediate=False)
+    # dashboards read monthly analytics from the materialized view, which only changes on refresh
+    app.timer(24 * 60 * 60, refresh_analytics_monthly_job, immediate=False)
 
     @ui.page("/")
     def index():
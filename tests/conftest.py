@@ -1,12 +1,90 @@
-from typing import Generator
+import base64
+import os
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, ContextManager, Generator, List
 import pytest
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import ASYNC_ENGINE, ENGINE, get_async_session, get_session, reset_db
+from app.models import Business, PlatformAccount, PlatformType, User as Owner
 from app.startup import startup
 from nicegui.testing import User
 
 pytest_plugins = ["nicegui.testing.plugin"]
 
+# credentials are sealed with a throwaway key unless the environment provides one
+os.environ.setdefault("APP_CREDENTIALS_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
+
 
 @pytest.fixture
 def user(user: User) -> Generator[User, None, None]:
     startup()
     yield user
+
+
+@pytest.fixture()
+def clean_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def platform_account(clean_db) -> PlatformAccount:
+    """A Thumbtack account of a freshly created business and owner."""
+    with get_session() as session:
+        owner = Owner(email="owner@example.com", first_name="Olivia", last_name="Owner", password_hash="hash")
+        session.add(owner)
+        session.commit()
+        session.refresh(owner)
+        assert owner.id is not None
+
+        business = Business(
+            owner_id=owner.id,
+            name="Leaky Pipes Plumbing",
+            description="Residential plumbing",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+        )
+        session.add(business)
+        session.commit()
+        session.refresh(business)
+        assert business.id is not None
+
+        account = PlatformAccount(
+            business_id=business.id, platform_type=PlatformType.THUMBTACK, account_id="tt-1", account_name="Leaky"
+        )
+        session.add(account)
+        session.commit()
+        session.refresh(account)
+        return account
+
+
+@pytest.fixture()
+async def async_session() -> AsyncGenerator[AsyncSession, None]:
+    """An AsyncSession whose pooled connections are dropped afterwards; they are bound to this test's event loop."""
+    async with get_async_session() as session:
+        yield session
+    await ASYNC_ENGINE.dispose()
+
+
+@contextmanager
+def _record_queries() -> Generator[List[str], None, None]:
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(ENGINE, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries() -> Callable[[], ContextManager[List[str]]]:
+    """`with count_queries() as queries:` collects every SQL statement ENGINE runs inside the block."""
+    return _record_queries
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlmodel import asc, func, select
+
+from app.analytics_service import copy_analytics, list_monthly_analytics
+from app.database import get_session, refresh_analytics_monthly
+from app.models import Analytics, PlatformType
+
+
+@pytest.mark.sqlmodel
+async def test_copy_analytics(platform_account, async_session):
+    business_id = platform_account.business_id
+    rows = [
+        Analytics(
+            business_id=business_id,
+            date=datetime(2025, 1, day),
+            platform_type=PlatformType.THUMBTACK,
+            leads_count=day,
+            total_spend_cents=1250 * day,
+            cost_per_lead=Decimal("12.50"),
+            conversion_rate=Decimal("0.2500"),
+            metrics={"impressions": 100 * day, "cpc": Decimal("1.25")},
+        )
+        for day in (1, 2, 3)
+    ]
+    rows.append(Analytics(business_id=business_id, date=datetime(2025, 1, 4)))
+
+    assert await copy_analytics(async_session, rows) == 4
+
+    with get_session() as session:
+        stored = session.exec(select(Analytics).order_by(asc(Analytics.date))).all()
+        assert [row.leads_count for row in stored] == [1, 2, 3, 0]
+        assert stored[1].platform_type == PlatformType.THUMBTACK
+        assert stored[1].total_spend == Decimal("25.00")
+        assert stored[1].cost_per_lead == Decimal("12.50")
+        assert stored[1].metrics == {"impressions": 200, "cpc": "1.25"}
+        assert stored[3].platform_type is None
+        assert all(row.id is not None and row.created_at is not None for row in stored)
+
+
+@pytest.mark.sqlmodel
+async def test_copy_analytics_outlasts_statement_timeout(platform_account, async_session):
+    # well above what the 1s statement_timeout lets one COPY write; rows only carry values, so one can repeat
+    rows = [Analytics(business_id=platform_account.business_id, date=datetime(2025, 1, 1), leads_count=1)] * 200_000
+
+    assert await copy_analytics(async_session, rows) == 200_000
+
+    with get_session() as session:
+        assert session.exec(select(func.count()).select_from(Analytics)).one() == 200_000
+
+
+@pytest.mark.sqlmodel
+async def test_copy_analytics_empty_batch(async_session):
+    assert await copy_analytics(async_session, []) == 0
+
+
+@pytest.mark.sqlmodel
+def test_monthly_analytics_rollup(platform_account):
+    business_id = platform_account.business_id
+    rows = [
+        Analytics(
+            business_id=business_id,
+            date=datetime(2025, 1, 1),
+            platform_type=PlatformType.THUMBTACK,
+            leads_count=2,
+            total_spend_cents=1000,
+            conversion_rate=Decimal("0.1000"),
+        ),
+        Analytics(
+            business_id=business_id,
+            date=datetime(2025, 1, 15),
+            platform_type=PlatformType.THUMBTACK,
+            leads_count=3,
+            total_spend_cents=2550,
+            conversion_rate=Decimal("0.3000"),
+        ),
+        Analytics(business_id=business_id, date=datetime(2025, 1, 20), leads_count=1),
+        Analytics(
+            business_id=business_id, date=datetime(2025, 2, 1), platform_type=PlatformType.THUMBTACK, leads_count=4
+        ),
+    ]
+    with get_session() as session:
+        session.add_all(rows)
+        session.commit()
+
+        # the view only changes on refresh
+        assert list_monthly_analytics(session, business_id) == []
+        refresh_analytics_monthly()
+        refresh_analytics_monthly()
+
+        months = list_monthly_analytics(session, business_id)
+        assert [(row.month.month, row.platform_type, row.leads_count) for row in months] == [
+            (1, PlatformType.THUMBTACK, 5),
+            (1, None, 1),
+            (2, PlatformType.THUMBTACK, 4),
+        ]
+        assert months[0].total_spend == Decimal("35.50")
+        assert months[0].conversion_rate == Decimal("0.2000")
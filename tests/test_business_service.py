@@ -0,0 +1,65 @@
+import pytest
+from sqlmodel import text
+
+from app import business_service
+from app.business_service import get_business, update_business
+from app.database import get_session
+from app.models import BusinessUpdate
+
+
+@pytest.fixture(autouse=True)
+def empty_business_cache():
+    business_service._business_cache.clear()
+    yield
+    business_service._business_cache.clear()
+
+
+@pytest.mark.sqlmodel
+def test_get_business_is_cached(platform_account, count_queries):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        business = get_business(session, business_id)
+        assert business is not None
+        assert business.name == "Leaky Pipes Plumbing"
+
+        with count_queries() as queries:
+            assert get_business(session, business_id) == business
+        assert queries == []
+
+
+@pytest.mark.sqlmodel
+def test_get_business_missing(clean_db):
+    with get_session() as session:
+        assert get_business(session, 404) is None
+
+
+@pytest.mark.sqlmodel
+def test_update_business_invalidates_cache(platform_account):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        get_business(session, business_id)
+        update_business(session, business_id, BusinessUpdate(name="Dry Pipes Plumbing"))
+
+        business = get_business(session, business_id)
+        assert business is not None
+        assert business.name == "Dry Pipes Plumbing"
+
+
+@pytest.mark.sqlmodel
+def test_get_business_revalidates_against_updated_at(platform_account, count_queries):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        get_business(session, business_id)
+
+        with count_queries() as queries:
+            assert get_business(session, business_id, revalidate=True) is not None
+        assert len(queries) == 1
+
+        # a write from another process that this cache never saw
+        session.execute(text("UPDATE businesses SET name = 'Renamed', updated_at = now() + interval '1 second'"))
+        session.commit()
+
+        stale = get_business(session, business_id)
+        fresh = get_business(session, business_id, revalidate=True)
+        assert stale is not None and stale.name == "Leaky Pipes Plumbing"
+        assert fresh is not None and fresh.name == "Renamed"
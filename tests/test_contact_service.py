@@ -0,0 +1,12 @@
+from app.contact_service import contact_key, contact_match
+
+
+def test_contact_key_normalizes():
+    assert contact_key(" Casey@Example.COM ", " 555-0100 ") == ("casey@example.com", "555-0100")
+    assert contact_key(None, "555-0100") == (None, "555-0100")
+    assert contact_key("", "  ") is None
+
+
+def test_contact_match_is_index_friendly():
+    clause = str(contact_match(("casey@example.com", None)).compile(compile_kwargs={"literal_binds": True}))
+    assert clause == "contacts.email = 'casey@example.com' AND contacts.phone IS NULL"
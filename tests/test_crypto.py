@@ -0,0 +1,47 @@
+import base64
+import os
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from app.crypto import NONCE_SIZE, credentials_key, decode_credentials_key, open_credentials, seal_credentials
+
+KEY = os.urandom(32)
+
+
+def test_seal_and_open_roundtrip():
+    sealed = seal_credentials({"api_token": "tt-secret", "expires_in": 3600}, key=KEY)
+
+    assert b"tt-secret" not in sealed
+    assert len(sealed) > NONCE_SIZE + 16
+    assert open_credentials(sealed, key=KEY) == {"api_token": "tt-secret", "expires_in": 3600}
+
+
+def test_seal_uses_a_fresh_nonce():
+    assert seal_credentials({"api_token": "x"}, key=KEY) != seal_credentials({"api_token": "x"}, key=KEY)
+
+
+def test_open_rejects_tampered_or_foreign_values():
+    sealed = bytearray(seal_credentials({"api_token": "x"}, key=KEY))
+    with pytest.raises(InvalidTag):
+        open_credentials(seal_credentials({"api_token": "x"}, key=KEY), key=os.urandom(32))
+    sealed[-1] ^= 1
+    with pytest.raises(InvalidTag):
+        open_credentials(bytes(sealed), key=KEY)
+
+
+def test_open_empty_value():
+    assert open_credentials(None, key=KEY) == {}
+
+
+def test_decode_credentials_key():
+    assert decode_credentials_key(base64.urlsafe_b64encode(KEY).decode()) == KEY
+
+    with pytest.raises(RuntimeError):
+        decode_credentials_key(base64.urlsafe_b64encode(b"short").decode())
+    with pytest.raises(RuntimeError):
+        decode_credentials_key(None)
+
+
+def test_credentials_key_from_environment():
+    # conftest sets APP_CREDENTIALS_KEY for the test session
+    assert credentials_key() == decode_credentials_key(os.environ["APP_CREDENTIALS_KEY"])
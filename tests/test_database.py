@@ -0,0 +1,10 @@
+import orjson
+from decimal import Decimal
+
+from app.database import json_dumps
+from app.models import LeadStatus
+
+
+def test_json_dumps_matches_stdlib_coercions():
+    payload = {"hours": {1: 2}, "status": LeadStatus.NEW, "budget": Decimal("12.50")}
+    assert orjson.loads(json_dumps(payload)) == {"hours": {"1": 2}, "status": "new", "budget": "12.50"}
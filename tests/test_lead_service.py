@@ -0,0 +1,274 @@
+import pytest
+import orjson
+from sqlmodel import select, text
+
+from app.database import get_session
+from app.lead_service import (
+    backfill_promoted_platform_fields,
+    bulk_insert_leads,
+    bulk_update_lead_status,
+    create_lead,
+    create_message,
+    export_leads_ndjson,
+    list_leads,
+    list_messages,
+    split_platform_data,
+    stream_messages,
+)
+from app.models import Contact, Lead, LeadCreate, LeadStatus, MessageCreate, PlatformAccount
+
+
+def lead_data(
+    account: PlatformAccount,
+    platform_lead_id: str,
+    customer_email: str | None = None,
+    customer_phone: str | None = None,
+    **platform_data,
+) -> LeadCreate:
+    assert account.id is not None
+    return LeadCreate(
+        platform_account_id=account.id,
+        customer_name="Casey Customer",
+        customer_email=customer_email,
+        customer_phone=customer_phone,
+        title="Fix kitchen sink",
+        description="Sink drains slowly",
+        location="Springfield, IL",
+        platform_lead_id=platform_lead_id,
+        platform_data=platform_data,
+    )
+
+
+def test_split_platform_data():
+    promoted, remainder = split_platform_data({"source_url": "https://tt.example/1", "score": 80, "urgency": "high"})
+    assert promoted == {"source_url": "https://tt.example/1", "score": 80}
+    assert remainder == {"urgency": "high"}
+
+
+def test_split_platform_data_without_promoted_keys():
+    promoted, remainder = split_platform_data({"urgency": "low"})
+    assert promoted == {}
+    assert remainder == {"urgency": "low"}
+
+
+def test_split_platform_data_keeps_values_that_do_not_fit_columns():
+    long_url = "https://tt.example/" + "x" * 600
+    promoted, remainder = split_platform_data({"source_url": long_url, "score": "hot"})
+    assert promoted == {}
+    assert remainder == {"source_url": long_url, "score": "hot"}
+
+    promoted, remainder = split_platform_data({"score": 2**40})
+    assert promoted == {}
+    promoted, remainder = split_platform_data({"score": 2.5, "source_url": None})
+    assert promoted == {}
+    assert remainder == {"score": 2.5, "source_url": None}
+    promoted, remainder = split_platform_data({"score": 65.0})
+    assert promoted == {"score": 65}
+
+
+@pytest.mark.sqlmodel
+def test_create_lead_promotes_platform_fields(platform_account):
+    with get_session() as session:
+        lead = create_lead(
+            session,
+            platform_account.business_id,
+            lead_data(platform_account, "tt-100", source_url="https://tt.example/100", score=72),
+        )
+
+        assert lead.source_url == "https://tt.example/100"
+        assert lead.score == 72
+        assert lead.platform_data == {}
+
+
+@pytest.mark.sqlmodel
+def test_backfill_promoted_platform_fields(platform_account):
+    with get_session() as session:
+        lead = create_lead(session, platform_account.business_id, lead_data(platform_account, "tt-200"))
+        # a lead stored before source_url/score were promoted
+        session.execute(
+            text(
+                """UPDATE leads SET platform_data = '{"source_url": "https://tt.example/200", "score": 65.0, "urgency": "high"}'"""
+            )
+        )
+        session.commit()
+
+        assert backfill_promoted_platform_fields(session) == 1
+
+        stored = session.get(Lead, lead.id)
+        assert stored is not None
+        session.refresh(stored)
+        assert stored.source_url == "https://tt.example/200"
+        assert stored.score == 65
+        assert stored.platform_data == {"urgency": "high"}
+
+
+@pytest.mark.sqlmodel
+def test_backfill_leaves_values_that_do_not_fit_columns(platform_account):
+    with get_session() as session:
+        lead = create_lead(session, platform_account.business_id, lead_data(platform_account, "tt-200"))
+        fractional = create_lead(session, platform_account.business_id, lead_data(platform_account, "tt-201"))
+        session.execute(
+            text(
+                """UPDATE leads SET platform_data = '{"source_url": "https://tt.example/200", "score": "hot"}'
+                   WHERE id = :id"""
+            ),
+            {"id": lead.id},
+        )
+        session.execute(
+            text("""UPDATE leads SET platform_data = '{"score": 2.5}' WHERE id = :id"""), {"id": fractional.id}
+        )
+        session.commit()
+
+        assert backfill_promoted_platform_fields(session) == 1
+
+        stored = session.get(Lead, lead.id)
+        assert stored is not None
+        session.refresh(stored)
+        assert stored.source_url == "https://tt.example/200"
+        assert stored.score is None
+        assert stored.platform_data == {"score": "hot"}
+        session.refresh(fractional)
+        assert (fractional.score, fractional.platform_data) == (None, {"score": 2.5})
+
+
+@pytest.mark.sqlmodel
+def test_bulk_insert_leads_with_values_that_do_not_fit_columns(platform_account):
+    long_url = "https://tt.example/" + "x" * 600
+    with get_session() as session:
+        lead_ids = bulk_insert_leads(
+            session,
+            platform_account.business_id,
+            [
+                lead_data(platform_account, "tt-1", score="hot"),
+                lead_data(platform_account, "tt-2", source_url=long_url, score=80),
+                lead_data(platform_account, "tt-3", score=2.5),
+            ],
+        )
+        assert len(lead_ids) == 3
+
+        leads = {lead.platform_lead_id: lead for lead in list_leads(session, platform_account.business_id)}
+        assert (leads["tt-1"].score, leads["tt-1"].platform_data) == (None, {"score": "hot"})
+        assert (leads["tt-2"].score, leads["tt-2"].source_url) == (80, None)
+        assert (leads["tt-3"].score, leads["tt-3"].platform_data) == (None, {"score": 2.5})
+        assert leads["tt-2"].platform_data == {"source_url": long_url}
+
+
+@pytest.mark.sqlmodel
+def test_bulk_insert_leads_skips_known_platform_leads(platform_account):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        first_ids = bulk_insert_leads(
+            session,
+            business_id,
+            [lead_data(platform_account, "tt-1", score=90), lead_data(platform_account, "tt-2", urgency="low")],
+        )
+        # the next poll returns tt-2 again alongside a new lead
+        second_ids = bulk_insert_leads(
+            session, business_id, [lead_data(platform_account, "tt-2"), lead_data(platform_account, "tt-3")]
+        )
+
+        assert len(first_ids) == 2
+        assert len(second_ids) == 1
+        leads = {lead.platform_lead_id: lead for lead in list_leads(session, business_id)}
+        assert set(leads) == {"tt-1", "tt-2", "tt-3"}
+        assert leads["tt-1"].score == 90
+        assert leads["tt-2"].platform_data == {"urgency": "low"}
+        assert leads["tt-3"].status == LeadStatus.NEW
+
+
+@pytest.mark.sqlmodel
+def test_bulk_insert_leads_empty_batch(platform_account):
+    with get_session() as session:
+        assert bulk_insert_leads(session, platform_account.business_id, []) == []
+
+
+@pytest.mark.sqlmodel
+def test_bulk_update_lead_status(platform_account):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        lead_ids = bulk_insert_leads(
+            session, business_id, [lead_data(platform_account, f"tt-{number}") for number in range(3)]
+        )
+
+        bulk_update_lead_status(session, lead_ids[:2], LeadStatus.CONTACTED)
+
+        statuses = sorted(lead.status for lead in list_leads(session, business_id))
+        assert statuses == [LeadStatus.CONTACTED, LeadStatus.CONTACTED, LeadStatus.NEW]
+
+
+@pytest.mark.sqlmodel
+def test_leads_and_messages_share_contacts(platform_account):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        lead_ids = bulk_insert_leads(
+            session,
+            business_id,
+            [
+                lead_data(platform_account, "tt-1", "Casey@Example.com", "555-0100"),
+                lead_data(platform_account, "tt-2", "casey@example.com", "555-0100"),
+                lead_data(platform_account, "tt-3", None, "555-0199"),
+                lead_data(platform_account, "tt-4"),
+            ],
+        )
+        lead = create_lead(session, business_id, lead_data(platform_account, "tt-5", None, "555-0199"))
+        create_message(
+            session,
+            MessageCreate(lead_id=lead_ids[0], sender_name="Casey", sender_email="casey@example.com", content="Hi"),
+        )
+
+        leads = {lead.platform_lead_id: lead for lead in list_leads(session, business_id)}
+        assert leads["tt-1"].contact_id == leads["tt-2"].contact_id
+        assert leads["tt-3"].contact_id == lead.contact_id
+        assert leads["tt-4"].contact is None
+        assert leads["tt-1"].contact is not None
+        assert leads["tt-1"].contact.email == "casey@example.com"
+
+        message = list_messages(session, lead_ids[0])[0]
+        assert message.contact is not None
+        assert (message.contact.email, message.contact.phone) == ("casey@example.com", None)
+        assert len(session.exec(select(Contact)).all()) == 3
+
+
+@pytest.mark.sqlmodel
+async def test_export_leads_ndjson(platform_account, async_session):
+    business_id = platform_account.business_id
+    with get_session() as session:
+        bulk_insert_leads(
+            session,
+            business_id,
+            [
+                lead_data(platform_account, "tt-0", "casey@example.com", "555-0100"),
+                lead_data(platform_account, "tt-1", None, "555-0199"),
+                lead_data(platform_account, "tt-2"),
+            ],
+        )
+
+    chunks = [chunk async for chunk in export_leads_ndjson(async_session, business_id)]
+
+    rows = [orjson.loads(chunk) for chunk in chunks]
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert [row["platform_lead_id"] for row in rows] == ["tt-0", "tt-1", "tt-2"]
+    assert rows[0]["status"] == "new"
+    assert [(row["email"], row["phone"]) for row in rows] == [
+        ("casey@example.com", "555-0100"),
+        (None, "555-0199"),
+        (None, None),
+    ]
+
+
+@pytest.mark.sqlmodel
+async def test_stream_messages_in_order(platform_account, async_session):
+    with get_session() as session:
+        lead = create_lead(session, platform_account.business_id, lead_data(platform_account, "tt-1"))
+        assert lead.id is not None
+        lead_id = lead.id
+        for content in ("first", "second"):
+            create_message(
+                session,
+                MessageCreate(lead_id=lead_id, sender_name="Casey", sender_email="casey@example.com", content=content),
+            )
+
+    messages = [message async for message in stream_messages(async_session, lead_id)]
+
+    assert [message.content for message in messages] == ["first", "second"]
+    assert all(message.contact is not None and message.contact.email == "casey@example.com" for message in messages)
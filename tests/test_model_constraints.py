@@ -0,0 +1,40 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel
+
+from app.database import get_session
+from app.models import Recommendation, Service
+
+
+def add(row: SQLModel) -> None:
+    with get_session() as session:
+        session.add(row)
+        session.commit()
+
+
+@pytest.mark.sqlmodel
+def test_service_price_range(platform_account):
+    business_id = platform_account.business_id
+    add(Service(business_id=business_id, name="Drain", description="", price_min=Decimal("50"), price_max=None))
+    with pytest.raises(IntegrityError, match="ck_service_price_range"):
+        add(
+            Service(
+                business_id=business_id, name="Sink", description="", price_min=Decimal("90"), price_max=Decimal("60")
+            )
+        )
+
+
+@pytest.mark.sqlmodel
+@pytest.mark.parametrize("priority, impact_score", [(0, None), (4, None), (1, 0), (3, 11)])
+def test_recommendation_bounds(platform_account, priority, impact_score):
+    recommendation = Recommendation(
+        business_id=platform_account.business_id,
+        type="budget_optimization",
+        title="Raise budget",
+        description="",
+        priority=priority,
+        impact_score=impact_score,
+    )
+    with pytest.raises(IntegrityError, match="ck_recommendation_"):
+        add(recommendation)
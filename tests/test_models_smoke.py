@@ -3,8 +3,9 @@
 import pytest
 from sqlmodel import SQLModel, text
 import os
+from datetime import date, datetime, timedelta
 
-from app.database import create_tables, ENGINE
+from app.database import create_tables, ensure_partitions, get_async_session, get_session, ENGINE, PARTITIONED_TABLES
 from app import models
 
 
@@ -28,6 +29,60 @@ def test_sqlmodel_smoke():
         assert table_name in db_tables, f"Table '{table_name}' not found in database"
 
 
+@pytest.mark.sqlmodel
+def test_partitions_smoke():
+    """Partitioned tables get a DEFAULT partition and one for the current month."""
+
+    create_tables()
+
+    with ENGINE.connect() as conn:
+        result = conn.execute(text("SELECT inhrelid::regclass::text FROM pg_inherits"))
+        partitions = {row[0] for row in result}
+
+    current_month = datetime.now().strftime("%Y_%m")
+    for table_name in PARTITIONED_TABLES:
+        assert f"{table_name}_default" in partitions
+        assert f"{table_name}_{current_month}" in partitions
+
+
+@pytest.mark.sqlmodel
+def test_partitions_adopt_rows_from_default(platform_account):
+    """A month whose rows already sit in DEFAULT still gets its partition, and the rows move into it."""
+    month = (date.today().replace(day=1) + timedelta(days=5 * 31)).replace(day=1)
+    with get_session() as session:
+        session.add(
+            models.Analytics(business_id=platform_account.business_id, date=datetime(month.year, month.month, 2))
+        )
+        session.commit()
+
+    ensure_partitions(months_ahead=6)
+
+    with ENGINE.connect() as conn:
+        partition = conn.execute(text("SELECT tableoid::regclass::text FROM analytics")).scalar()
+    assert partition == f"analytics_{month:%Y_%m}"
+
+
+@pytest.mark.sqlmodel
+def test_partitions_refuse_unpartitioned_table(clean_db):
+    """A plain table left over from before partitioning fails with a pointer to the conversion, not a DDL error."""
+    with ENGINE.begin() as conn:
+        conn.execute(text("DROP TABLE messages CASCADE"))
+        conn.execute(text("CREATE TABLE messages (id serial PRIMARY KEY)"))
+
+    with pytest.raises(RuntimeError, match="messages is not a partitioned table"):
+        ensure_partitions()
+
+
+@pytest.mark.sqlmodel
+async def test_async_engine_smoke():
+    """The asyncpg engine connects and applies its server settings."""
+    create_tables()
+
+    async with get_async_session() as session:
+        jit = await session.scalar(text("SELECT current_setting('jit')"))
+        assert jit == "off"
+
+
 DATABRICKS_HOST = os.environ.get("DATABRICKS_HOST")
 DATABRICKS_TOKEN = os.environ.get("DATABRICKS_TOKEN")
 
@@ -0,0 +1,29 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from pydantic import ValidationError
+
+from app.models import Analytics, User, UserCreate
+
+
+def test_user_create_lowercases_email():
+    user = UserCreate(email="Jane.Doe+Leads@Example.COM", first_name="Jane", last_name="Doe", password="secret123")
+    assert user.email == "jane.doe+leads@example.com"
+
+
+def test_user_create_rejects_invalid_email():
+    with pytest.raises(ValidationError):
+        UserCreate(email="not-an-email", first_name="Jane", last_name="Doe", password="secret123")
+
+
+def test_user_model_validate_lowercases_email():
+    user = User.model_validate(
+        {"email": "Owner@Example.com", "first_name": "Jane", "last_name": "Doe", "password_hash": "hash"}
+    )
+    assert user.email == "owner@example.com"
+
+
+def test_analytics_money_totals_from_cents():
+    analytics = Analytics(business_id=1, date=datetime(2025, 1, 1), total_spend_cents=12345)
+    assert analytics.total_spend == Decimal("123.45")
+    assert analytics.total_revenue == Decimal("0.00")
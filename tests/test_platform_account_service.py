@@ -0,0 +1,39 @@
+import pytest
+from sqlmodel import text
+
+from app.database import get_session
+from app.models import PlatformAccount, PlatformAccountCreate, PlatformAccountUpdate, PlatformType
+from app.platform_account_service import create_platform_account, platform_credentials, update_platform_account
+
+
+@pytest.mark.sqlmodel
+def test_platform_account_credentials_are_stored_sealed(platform_account):
+    with get_session() as session:
+        account = create_platform_account(
+            session,
+            platform_account.business_id,
+            PlatformAccountCreate(
+                platform_type=PlatformType.TASKRABBIT,
+                account_id="tr-1",
+                account_name="Leaky",
+                credentials={"token": "s3"},
+            ),
+        )
+        stored = session.execute(
+            text("SELECT credentials_ct FROM platform_accounts WHERE id = :id"), {"id": account.id}
+        )
+        assert b"s3" not in stored.scalar_one()
+        assert platform_credentials(account) == {"token": "s3"}
+
+        assert account.id is not None
+        updated = update_platform_account(session, account.id, PlatformAccountUpdate(credentials={"token": "s4"}))
+        assert updated is not None
+        assert platform_credentials(updated) == {"token": "s4"}
+
+        updated = update_platform_account(session, account.id, PlatformAccountUpdate(account_name="Leaky Pipes"))
+        assert updated is not None
+        assert platform_credentials(updated) == {"token": "s4"}
+
+        stored_account = session.get(PlatformAccount, platform_account.id)
+        assert stored_account is not None
+        assert platform_credentials(stored_account) == {}
@@ -0,0 +1,156 @@
+"""List queries must load what the list shows in a bounded number of statements, independent of row count."""
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.business_service import list_businesses
+from app.database import get_session
+from app.lead_service import create_lead, create_message, list_leads, list_messages
+from app.models import Business, LeadCreate, LeadStatus, Message, MessageCreate, PlatformAccount, Service
+
+ROWS = 5
+
+
+def add_leads(account: PlatformAccount) -> int:
+    assert account.id is not None
+    with get_session() as session:
+        service = Service(business_id=account.business_id, name="Drain cleaning", description="Clear clogged drains")
+        session.add(service)
+        session.commit()
+        session.refresh(service)
+        for number in range(ROWS):
+            create_lead(
+                session,
+                account.business_id,
+                LeadCreate(
+                    platform_account_id=account.id,
+                    service_id=service.id,
+                    customer_name=f"Customer {number}",
+                    title="Fix kitchen sink",
+                    description="Sink drains slowly",
+                    location="Springfield, IL",
+                    platform_lead_id=f"tt-{number}",
+                ),
+            )
+    return account.business_id
+
+
+@pytest.mark.sqlmodel
+def test_list_leads_query_count(platform_account, count_queries):
+    business_id = add_leads(platform_account)
+
+    with get_session() as session:
+        with count_queries() as queries:
+            leads = list_leads(session, business_id, status=LeadStatus.NEW)
+            labels = [(lead.platform_account.account_name, lead.service and lead.service.name) for lead in leads]
+
+        assert len(leads) == ROWS
+        assert labels[0] == ("Leaky", "Drain cleaning")
+        assert len(queries) <= 2
+
+        with pytest.raises(InvalidRequestError):
+            leads[0].business
+
+
+@pytest.mark.sqlmodel
+def test_list_messages_query_count(platform_account, count_queries):
+    business_id = add_leads(platform_account)
+
+    with get_session() as session:
+        lead_id = list_leads(session, business_id)[0].id
+        assert lead_id is not None
+        for number in range(ROWS):
+            session.add(Message(lead_id=lead_id, sender_name="Casey Customer", content=f"Message {number}"))
+        session.commit()
+
+        with count_queries() as queries:
+            messages = list_messages(session, lead_id)
+            senders = [message.user for message in messages]
+
+        assert [message.content for message in messages] == [f"Message {number}" for number in range(ROWS)]
+        assert senders == [None] * ROWS
+        assert len(queries) <= 2
+
+
+@pytest.mark.sqlmodel
+def test_list_businesses_query_count(platform_account, count_queries):
+    with get_session() as session:
+        owner_business = session.get(Business, platform_account.business_id)
+        assert owner_business is not None
+        owner_id = owner_business.owner_id
+        for number in range(ROWS):
+            business = Business(
+                owner_id=owner_id,
+                name=f"Branch {number}",
+                description="Residential plumbing",
+                address=f"{number} Side St",
+                city="Springfield",
+                state="IL",
+                zip_code="62701",
+            )
+            session.add(business)
+            session.commit()
+            session.refresh(business)
+            assert business.id is not None
+            session.add(Service(business_id=business.id, name="Drain cleaning", description="Clear clogged drains"))
+            session.commit()
+        session.expunge_all()
+
+        with count_queries() as queries:
+            businesses = list_businesses(session, owner_id)
+            service_counts = [len(business.services) for business in businesses]
+
+        assert len(businesses) == ROWS + 1
+        assert sum(service_counts) == ROWS
+        assert len(queries) <= 2
+
+        with pytest.raises(InvalidRequestError):
+            businesses[0].platform_accounts
+
+
+@pytest.mark.sqlmodel
+def test_create_lead_does_not_load_collections(platform_account, count_queries):
+    business_id = add_leads(platform_account)
+    assert platform_account.id is not None
+
+    with get_session() as session:
+        with count_queries() as queries:
+            lead = create_lead(
+                session,
+                business_id,
+                LeadCreate(
+                    platform_account_id=platform_account.id,
+                    customer_name="Casey Customer",
+                    title="Fix kitchen sink",
+                    description="Sink drains slowly",
+                    location="Springfield, IL",
+                    platform_lead_id="tt-new",
+                ),
+            )
+
+        # the INSERT and the refresh; no SELECT of the business's other leads or the account's campaigns
+        assert len(queries) == 2
+        assert {type(row).__name__ for row in session.identity_map.values()} == {"Lead", "Business", "PlatformAccount"}
+        assert lead.business.id == business_id
+
+
+@pytest.mark.sqlmodel
+def test_create_message_does_not_join_the_lead(platform_account, count_queries):
+    business_id = add_leads(platform_account)
+
+    with get_session() as session:
+        lead_id = list_leads(session, business_id)[0].id
+        assert lead_id is not None
+        session.expunge_all()
+
+        with count_queries() as queries:
+            message = create_message(session, MessageCreate(lead_id=lead_id, sender_name="Casey", content="Hi"))
+
+        # the INSERT and the refresh, which joins only the message's user and contact
+        assert len(queries) == 2
+        assert queries[1].count(" JOIN ") == 2
+        assert "leads" not in queries[1]
+        assert {type(row).__name__ for row in session.identity_map.values()} == {"Message"}
+
+        with pytest.raises(InvalidRequestError):
+            message.lead